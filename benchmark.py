@@ -0,0 +1,165 @@
+"""Benchmark of puzzle solutions"""
+
+__author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
+__date__ = "2025"
+__license__ = "MIT"
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import intcode
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+DAYS = range(1, 20)
+STARS = ("star_1", "star_2")
+
+
+def main():
+    """Benchmark puzzle solutions.
+
+    Compiled Intcode programs are cached on disk in a temporary directory
+    for the whole run, so timings do not depend on earlier runs, while
+    warmup rounds fill it as normal use would.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--days", default="1-19", help="days to run, e.g. 1-5,9"
+    )
+    parser.add_argument("--data", default=DATA_DIR, help="input directory")
+    parser.add_argument("--warmup", type=int, default=1, help="warmup rounds")
+    parser.add_argument("--repeat", type=int, default=5, help="timed rounds")
+    parser.add_argument(
+        "--output", default="benchmark.json", help="results file to write"
+    )
+    parser.add_argument("--baseline", help="results file to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative slowdown of the median",
+    )
+    args = parser.parse_args()
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        intcode.CACHE_DIR = cache_dir
+
+        for day in parse_days(args.days):
+            for star, timings in benchmark_day(
+                day, args.data, args.warmup, args.repeat
+            ).items():
+                results[f"day_{day}.{star}"] = timings
+                print(
+                    f"day_{day}.{star}: median {timings['median']:.6f}s,"
+                    f" p95 {timings['p95']:.6f}s"
+                )
+
+    with open(args.output, "w", encoding="ascii") as output_file:
+        json.dump(results, output_file, indent=2)
+        output_file.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="ascii") as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = compare(results, baseline, args.tolerance)
+
+        for name, ratio in regressions.items():
+            print(f"regression {name}: {ratio:.2f}x baseline median")
+
+        if regressions:
+            sys.exit(1)
+
+
+def benchmark_day(day, data, warmup, repeat):
+    """Time both stars of a day."""
+    module = importlib.import_module(f"day_{day}")
+    puzzle_input = module.read_input(os.path.join(data, f"day_{day}.txt"))
+    results = {}
+
+    for star in STARS:
+        function = getattr(module, star)
+
+        for _ in range(warmup):
+            clear_caches(module)
+            function(puzzle_input)
+
+        times = []
+
+        for _ in range(repeat):
+            clear_caches(module)
+            start = time.perf_counter()
+            function(puzzle_input)
+            times.append(time.perf_counter() - start)
+
+        results[star] = summarize(times)
+
+    return results
+
+
+def clear_caches(module):
+    """Clear memoized functions of a module, so rounds are independent.
+
+    Repository modules it imports from, such as intcode, are cleared too.
+    The on-disk compile cache is kept.
+    """
+    modules = {module} | {
+        sys.modules[value.__module__]
+        for value in vars(module).values()
+        if getattr(value, "__module__", None) in sys.modules
+    }
+
+    for imported in modules:
+        if os.path.dirname(getattr(imported, "__file__", "")) != ROOT_DIR:
+            continue
+
+        for value in vars(imported).values():
+            if callable(getattr(value, "cache_clear", None)):
+                value.cache_clear()
+
+
+def compare(results, baseline, tolerance):
+    """Find medians slower than baseline beyond tolerance."""
+    return {
+        name: timings["median"] / baseline[name]["median"]
+        for name, timings in results.items()
+        if name in baseline
+        and timings["median"] > baseline[name]["median"] * (1 + tolerance)
+    }
+
+
+def parse_days(days):
+    """Parse days from ranges like 1-5,9."""
+    selected = []
+
+    for chunk in days.split(","):
+        first, _, last = chunk.partition("-")
+        selected.extend(range(int(first), int(last or first) + 1))
+
+    return [day for day in selected if day in DAYS]
+
+
+def summarize(times):
+    """Summarize timings with median and 95th percentile."""
+    if len(times) > 1:
+        p95 = statistics.quantiles(times, n=20, method="inclusive")[18]
+    else:
+        p95 = times[0]
+
+    return {
+        "median": statistics.median(times),
+        "p95": p95,
+        "times": times,
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,7 @@ __license__ = "MIT"
 
 def main():
     """Solve day 1 puzzles."""
-    with open("data/day_1.txt", encoding="ascii") as input_file:
-        puzzle_input = tuple(line.rstrip() for line in input_file.readlines())
+    puzzle_input = read_input("data/day_1.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -33,5 +32,11 @@ def star_2(puzzle_input):
     return fuel
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return tuple(line.rstrip() for line in input_file.readlines())
+
+
 if __name__ == "__main__":
     main()
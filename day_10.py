@@ -11,8 +11,7 @@ from math import pi
 
 def main():
     """Solve day 10 puzzles."""
-    with open("data/day_10.txt", encoding="ascii") as input_file:
-        puzzle_input = tuple(line.rstrip() for line in input_file.readlines())
+    puzzle_input = read_input("data/day_10.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -83,6 +82,12 @@ def load_asteroids(puzzle_input):
     }
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return tuple(line.rstrip() for line in input_file.readlines())
+
+
 def shift_phase(phase):
     """Shift the phase in order to start from the top."""
     return phase if phase >= -pi / 2 else phase + 2 * pi
@@ -4,23 +4,17 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
+import bisect
 import itertools
 import math
-from dataclasses import dataclass, field
+import operator
 
-
-@dataclass
-class Moon:
-    """Moon."""
-
-    position: list[int]
-    velocity: list[int] = field(default_factory=lambda: [0, 0, 0])
+AXES = (0, 1, 2)
 
 
 def main():
     """Solve day 12 puzzles."""
-    with open("data/day_12.txt", encoding="ascii") as input_file:
-        puzzle_input = tuple(line.rstrip() for line in input_file.readlines())
+    puzzle_input = read_input("data/day_12.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -28,90 +22,176 @@ def main():
 
 def star_1(puzzle_input):
     """Solve first puzzle."""
-    moons = load_moons(puzzle_input)
+    positions = load_universes([load_moons(puzzle_input)])
+    velocities = [[[0] * len(row) for row in axis] for axis in positions]
 
     for _ in range(1000):
-        moons = step(moons)
+        for axis in AXES:
+            positions[axis], velocities[axis] = step_universes(
+                positions[axis], velocities[axis]
+            )
 
-    return sum(
-        sum(abs(dimension) for dimension in moon.position)
-        * sum(abs(dimension) for dimension in moon.velocity)
-        for moon in moons
-    )
+    return compute_energies(positions, velocities)[0]
 
 
 def star_2(puzzle_input):
     """Solve second puzzle."""
     moons = load_moons(puzzle_input)
-    initial = [
-        [(moon.position[i], moon.velocity[i]) for moon in moons]
-        for i in range(3)
-    ]
-    periods = []
-    dimensions = {0, 1, 2}
-    moons = step(moons, dimensions)
-    i = 1
 
-    while len(periods) < 3:
-        to_remove = set()
+    return math.lcm(*(find_period(list(axis)) for axis in zip(*moons)))
+
+
+def compute_energies(positions, velocities):
+    """Compute total energy of each universe."""
+    energies = [0] * len(positions[0][0])
+
+    for moon, _ in enumerate(positions[0]):
+        potential = sum_absolute(axis[moon] for axis in positions)
+        kinetic = sum_absolute(axis[moon] for axis in velocities)
+        energies = list(
+            map(operator.add, energies, map(operator.mul, potential, kinetic))
+        )
+
+    return energies
+
+
+def find_period(positions):
+    """Find steps for moons at rest to repeat their state along an axis.
+
+    Axes are independent and steps are reversible, so the first repeated
+    state is the initial one.
+    """
+    initial = (positions, [0] * len(positions))
+    state = step(*initial)
+    steps = 1
+
+    while state != initial:
+        state = step(*state)
+        steps += 1
+
+    return steps
+
+
+def find_periods(positions):
+    """Find steps for each universe at rest to repeat its state on an axis.
+
+    Positions have shape (moons, universes), as in step_universes.
+    """
+    velocities = [[0] * len(row) for row in positions]
+    periods = [0] * len(positions[0])
+    pending = len(periods)
+    state = (positions, velocities)
+    steps = 0
+
+    while pending:
+        state = step_universes(*state)
+        steps += 1
+        repeated = map(
+            all,
+            zip(
+                *(
+                    map(operator.eq, *rows)
+                    for rows in zip(state[0], positions)
+                ),
+                *(map(operator.not_, row) for row in state[1]),
+            ),
+        )
+
+        for universe in itertools.compress(range(len(periods)), repeated):
+            if not periods[universe]:
+                periods[universe] = steps
+                pending -= 1
 
-        for j in dimensions:
-            entry = [(moon.position[j], moon.velocity[j]) for moon in moons]
+    return periods
 
-            if entry == initial[j]:
-                periods.append(i)
-                to_remove.add(j)
 
-        if to_remove:
-            dimensions -= to_remove
+def gravity(positions):
+    """Compute velocity changes along an axis.
 
-        moons = step(moons, dimensions)
-        i += 1
+    Each body is pulled by the bodies above it and pushed by those below
+    it, counted by ranking the positions in sorted order.
+    """
+    ordered = sorted(positions)
+    count = len(ordered)
 
-    return math.lcm(*periods)
+    return [
+        count
+        - bisect.bisect_right(ordered, position)
+        - bisect.bisect_left(ordered, position)
+        for position in positions
+    ]
 
 
 def load_moons(puzzle_input):
-    """Load moons from input."""
+    """Load moon positions from input."""
     return [
-        Moon(
-            list(
-                map(
-                    int,
-                    (chunk.split("=")[1] for chunk in line[1:-1].split(", ")),
-                )
-            ),
+        list(
+            map(
+                int,
+                (chunk.split("=")[1] for chunk in line[1:-1].split(", ")),
+            )
         )
         for line in puzzle_input
     ]
 
 
-def step(moons, dimensions=(0, 1, 2)):
-    """Perform a step on given dimensions."""
-    return update_positions(update_velocities(moons, dimensions), dimensions)
+def load_universes(systems):
+    """Load positions of many systems, with shape (axes, moons, universes)."""
+    return [
+        [
+            [system[moon][axis] for system in systems]
+            for moon, _ in enumerate(systems[0])
+        ]
+        for axis in AXES
+    ]
+
+
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return tuple(line.rstrip() for line in input_file.readlines())
+
+
+def step(positions, velocities):
+    """Perform a step along an axis."""
+    velocities = list(map(operator.add, velocities, gravity(positions)))
+
+    return list(map(operator.add, positions, velocities)), velocities
+
 
+def step_universes(positions, velocities):
+    """Perform a step of many universes along an axis.
 
-def update_positions(moons, dimensions):
-    """Update moons positions."""
-    for moon in moons:
-        for i in dimensions:
-            moon.position[i] += moon.velocity[i]
+    Positions and velocities have shape (moons, universes), so the pull of
+    each pair of moons is computed for all universes at once, mapping
+    comparisons over whole rows.
+    """
+    changes = [[0] * len(row) for row in positions]
 
-    return moons
+    for i, j in itertools.combinations(range(len(positions)), 2):
+        signs = list(
+            map(
+                operator.sub,
+                map(operator.gt, positions[j], positions[i]),
+                map(operator.lt, positions[j], positions[i]),
+            )
+        )
+        changes[i] = list(map(operator.add, changes[i], signs))
+        changes[j] = list(map(operator.sub, changes[j], signs))
+
+    velocities = [
+        list(map(operator.add, *rows)) for rows in zip(velocities, changes)
+    ]
+    positions = [
+        list(map(operator.add, *rows)) for rows in zip(positions, velocities)
+    ]
 
+    return positions, velocities
 
-def update_velocities(moons, dimensions):
-    """Update moons velocities."""
-    for moon_0, moon_1 in itertools.combinations(moons, 2):
-        for i in dimensions:
-            if moon_1.position[i] > moon_0.position[i]:
-                moon_0.velocity[i] += 1
-                moon_1.velocity[i] -= 1
-            elif moon_1.position[i] < moon_0.position[i]:
-                moon_0.velocity[i] -= 1
-                moon_1.velocity[i] += 1
 
-    return moons
+def sum_absolute(rows):
+    """Sum absolute values of rows, for each universe."""
+    return map(sum, zip(*(map(abs, row) for row in rows)))
 
 
 if __name__ == "__main__":
@@ -4,13 +4,12 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
-from collections import defaultdict
+from intcode import Intcode
 
 
 def main():
     """Solve day 13 puzzles."""
-    with open("data/day_13.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_13.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -42,31 +41,14 @@ class Arcade:
     def __init__(self, program):
         self.blocks = set()
         self.score = 0
-        self._program = defaultdict(int)
-        self._i = 0
-        self._relative_base = 0
+        self._intcode = Intcode(program)
         self._ball = None
         self._paddle = None
 
-        for i, number in enumerate(program):
-            self._program[i] = number
-
-    def get_value(self, index, mode):
-        """Get value of operand."""
-        match mode:
-            case 0:
-                return self._program[self._program[index]]
-            case 1:
-                return self._program[index]
-            case 2:
-                return self._program[
-                    self._program[index] + self._relative_base
-                ]
-
     def play(self, free=False):
         """Play a whole game."""
         if free:
-            self._program[0] = 2
+            self._intcode[0] = 2
 
         joystick = 0
         halted = self.run(joystick)
@@ -87,81 +69,32 @@ class Arcade:
 
     def run(self, input_):
         """Run arcade with given joystick input."""
-
         output = []
 
         while True:
-            instruction = f"{self._program[self._i]:05}"
-            opcode = int(instruction[3:])
-            mode_1 = int(instruction[2])
-            mode_2 = int(instruction[1])
-            index_1 = self._program[self._i + 1] + self._relative_base * (
-                instruction[2] == "2"
-            )
-            index_3 = self._program[self._i + 3] + self._relative_base * (
-                instruction[0] == "2"
-            )
-
-            match opcode:
-                case 1:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) + self.get_value(self._i + 2, mode_2)
-                    self._i += 4
+            output += self._intcode.run(3 - len(output))
+
+            if self._intcode.halted:
+                return True
+
+            if len(output) < 3:
+                self._intcode.inputs.append(input_)
+                continue
+
+            if output[:2] == [-1, 0]:
+                self.score = output[2]
+            match output[2]:
+                case 0:
+                    self.blocks.discard(tuple(output[:2]))
                 case 2:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) * self.get_value(self._i + 2, mode_2)
-                    self._i += 4
+                    self.blocks.add(tuple(output[:2]))
                 case 3:
-                    self._program[index_1] = input_
-                    self._i += 2
+                    self._paddle = tuple(output[:2])
                 case 4:
-                    output.append(self.get_value(self._i + 1, mode_1))
-                    self._i += 2
-                case 5:
-                    if self.get_value(self._i + 1, mode_1) != 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 6:
-                    if self.get_value(self._i + 1, mode_1) == 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 7:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        < self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 8:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        == self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 9:
-                    self._relative_base += self.get_value(self._i + 1, mode_1)
-                    self._i += 2
-                case 99:
-                    return True
-
-            if len(output) == 3:
-                if output[:2] == [-1, 0]:
-                    self.score = output[2]
-                match output[2]:
-                    case 0:
-                        self.blocks.discard(tuple(output[:2]))
-                    case 2:
-                        self.blocks.add(tuple(output[:2]))
-                    case 3:
-                        self._paddle = tuple(output[:2])
-                    case 4:
-                        self._ball = tuple(output[:2])
-                        break
-
-                output = []
+                    self._ball = tuple(output[:2])
+                    break
+
+            output = []
 
         return False
 
@@ -171,5 +104,11 @@ def load_program(puzzle_input):
     return tuple(map(int, puzzle_input.split(",")))
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
 if __name__ == "__main__":
     main()
@@ -4,16 +4,16 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
-import math
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
 
+CACHE_SIZE = 1024
 MAX_ORE = 1000000000000
+REFINEMENTS = 5
 
 
 def main():
     """Solve day 14 puzzles."""
-    with open("data/day_14.txt", encoding="ascii") as input_file:
-        puzzle_input = tuple(line.rstrip() for line in input_file.readlines())
+    puzzle_input = read_input("data/day_14.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -21,63 +21,145 @@ def main():
 
 def star_1(puzzle_input):
     """Solve first puzzle."""
-    reactions = load_reactions(puzzle_input)
-
-    return fuel_to_ore(reactions, 1)
+    return Reactions(puzzle_input).ore(1)
 
 
 def star_2(puzzle_input):
     """Solve second puzzle."""
-    reactions = load_reactions(puzzle_input)
-    min_fuel = 0
-    max_fuel = MAX_ORE
+    return Reactions(puzzle_input).fuel(MAX_ORE)
+
+
+class Reactions:
+    """Preprocessed reactions answering batches of ore and fuel queries.
+
+    Answers are kept in caches evicting the least recently used ones.
+    """
+
+    def __init__(self, puzzle_input, cache_size=CACHE_SIZE):
+        self._reactions = load_reactions(puzzle_input)
+        self._cache_size = cache_size
+        self._ores = OrderedDict()
+        self._fuels = OrderedDict()
+
+    def fuel(self, ore):
+        """Find maximum fuel produced with given ore."""
+        if ore in self._fuels:
+            self._fuels.move_to_end(ore)
+
+            return self._fuels[ore]
+
+        fuel = self._max_fuel(ore)
+        self._remember(self._fuels, ore, fuel)
+
+        return fuel
+
+    def fuels(self, ores):
+        """Find maximum fuel produced with each amount of ore."""
+        return [self.fuel(ore) for ore in ores]
+
+    def ore(self, fuel):
+        """Compute ore needed for an amount of fuel."""
+        return self.ores((fuel,))[0]
+
+    def ores(self, fuels):
+        """Compute ore needed for each amount of fuel.
+
+        Amounts missing from the cache are computed in a single pass.
+        """
+        fuels = tuple(fuels)
+        answers = {
+            fuel: self._ores[fuel] for fuel in fuels if fuel in self._ores
+        }
+        missing = [
+            fuel for fuel in dict.fromkeys(fuels) if fuel not in answers
+        ]
+        answers.update(zip(missing, fuels_to_ores(self._reactions, missing)))
+
+        for fuel in dict.fromkeys(fuels):
+            self._remember(self._ores, fuel, answers[fuel])
+
+        return [answers[fuel] for fuel in fuels]
+
+    def _max_fuel(self, ore):
+        """Search maximum fuel produced with given ore.
 
-    while max_fuel - min_fuel > 1:
-        fuel = (max_fuel + min_fuel) // 2
-        ore = fuel_to_ore(reactions, fuel)
+        Fuel is first estimated by scaling with the ore per fuel of the last
+        estimate, then settled by galloping and bisecting around it.
+        """
+        fuel = ore // self.ore(1)
 
-        if ore <= MAX_ORE:
-            min_fuel = fuel
+        for _ in range(REFINEMENTS):
+            estimate = fuel * ore // max(self.ore(fuel), 1)
+
+            if estimate == fuel:
+                break
+
+            fuel = estimate
+
+        step = 1
+
+        if self.ore(fuel) <= ore:
+            low = fuel
+
+            while self.ore(low + step) <= ore:
+                low += step
+                step *= 2
+
+            high = low + step
         else:
-            max_fuel = fuel
+            high = fuel
+
+            while high - step > 0 and self.ore(high - step) > ore:
+                high -= step
+                step *= 2
+
+            low = max(high - step, 0)
 
-    return min_fuel
+        while high - low > 1:
+            fuel = (low + high) // 2
 
+            if self.ore(fuel) <= ore:
+                low = fuel
+            else:
+                high = fuel
 
-def fuel_to_ore(reactions, fuel):
-    """Convert fuel to ore."""
-    totals = defaultdict(lambda: [0, 0])
-    totals["ORE"] = 0
-    needed = [("FUEL", fuel)]
+        return low
 
-    while needed:
-        element, needed_quantity = needed.pop(0)
+    def _remember(self, cache, key, value):
+        """Store a value in a cache, evicting the least recently used."""
+        cache[key] = value
+        cache.move_to_end(key)
 
-        if element == "ORE":
-            totals[element] += needed_quantity
-            continue
+        while len(cache) > self._cache_size:
+            cache.popitem(last=False)
 
-        min_quantity, inputs = reactions[element]
 
-        if totals[element][1] - totals[element][0] < needed_quantity:
-            batches = math.ceil(
-                (needed_quantity - totals[element][1] + totals[element][0])
-                / min_quantity
-            )
+def fuels_to_ores(reactions, fuels):
+    """Convert amounts of fuel to ore.
 
-            totals[element][1] += batches * min_quantity
+    Reactions are in topological order, so each chemical is needed in its
+    final quantities by the time it is reached.
+    """
+    needed = defaultdict(lambda: [0] * len(fuels))
+    needed["FUEL"] = list(fuels)
 
-            for chemical in inputs:
-                needed.append((chemical[0], batches * chemical[1]))
+    for element, (min_quantity, inputs) in reactions.items():
+        batches = [
+            -(-quantity // min_quantity) for quantity in needed[element]
+        ]
 
-        totals[element][0] += needed_quantity
+        for chemical, quantity in inputs:
+            needed[chemical] = [
+                total + batch * quantity
+                for total, batch in zip(needed[chemical], batches)
+            ]
 
-    return totals["ORE"]
+    return needed["ORE"]
 
 
 def load_reactions(puzzle_input):
-    """Load reactions from input."""
-    return dict(parse_rection(line) for line in puzzle_input)
+    """Load reactions from input, in topological order."""
+    return sort_reactions(dict(parse_rection(line) for line in puzzle_input))
 
 
 def parse_chemical(chemical):
@@ -98,5 +180,32 @@ def parse_rection(reaction):
     return output[0], (output[1], inputs)
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return tuple(line.rstrip() for line in input_file.readlines())
+
+
+def sort_reactions(reactions):
+    """Sort reactions so each chemical comes before all of its inputs."""
+    consumers = Counter(
+        chemical for _, inputs in reactions.values() for chemical, _ in inputs
+    )
+    ready = [element for element in reactions if not consumers[element]]
+    ordered = {}
+
+    while ready:
+        element = ready.pop()
+        ordered[element] = reactions[element]
+
+        for chemical, _ in reactions[element][1]:
+            consumers[chemical] -= 1
+
+            if not consumers[chemical] and chemical in reactions:
+                ready.append(chemical)
+
+    return ordered
+
+
 if __name__ == "__main__":
     main()
@@ -4,17 +4,18 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
-import copy
 from collections import defaultdict, deque
 from functools import cache
 
+from grid import Grid, flood_fill
+from intcode import Intcode
+
 DIRECTIONS = {1: 1j, 2: -1j, 3: -1, 4: 1}
 
 
 def main():
     """Solve day 15 puzzles."""
-    with open("data/day_15.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_15.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -32,111 +33,25 @@ def star_2(puzzle_input):
     program = load_program(puzzle_input)
 
     _, oxygen, locations = explore(program)
-    current = {oxygen}
-    locations.remove(oxygen)
-    i = 0
-
-    while locations:
-        i += 1
-        new_current = set()
-
-        for location in current:
-            for direction in DIRECTIONS.values():
-                if location + direction in locations:
-                    new_current.add(location + direction)
-                    locations.remove(location + direction)
-
-        current = new_current
+    grid, (top, left) = load_grid(locations)
+    start = grid.index(int(oxygen.real) - top, int(oxygen.imag) - left)
 
-    return i
+    return len(flood_fill(grid, (start,), b".")) - 1
 
 
 class Droid:
     """Repair droid."""
 
-    def __init__(self, program):
-        self._program = defaultdict(int)
-        self._i = 0
-        self._relative_base = 0
-
-        for i, number in enumerate(program):
-            self._program[i] = number
-
-    def get_value(self, index, mode):
-        """Get value of operand."""
-        match mode:
-            case 0:
-                return self._program[self._program[index]]
-            case 1:
-                return self._program[index]
-            case 2:
-                return self._program[
-                    self._program[index] + self._relative_base
-                ]
+    def __init__(self, program=None, intcode=None):
+        self._intcode = Intcode(program) if intcode is None else intcode
+
+    def fork(self):
+        """Fork droid, sharing its memory copy-on-write."""
+        return Droid(intcode=self._intcode.fork())
 
     def run(self, input_):
         """Run droid with given input."""
-        output = None
-
-        while True:
-            instruction = f"{self._program[self._i]:05}"
-            opcode = int(instruction[3:])
-            mode_1 = int(instruction[2])
-            mode_2 = int(instruction[1])
-            index_1 = self._program[self._i + 1] + self._relative_base * (
-                instruction[2] == "2"
-            )
-            index_3 = self._program[self._i + 3] + self._relative_base * (
-                instruction[0] == "2"
-            )
-
-            match opcode:
-                case 1:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) + self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 2:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) * self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 3:
-                    self._program[index_1] = input_
-                    self._i += 2
-                case 4:
-                    output = self.get_value(self._i + 1, mode_1)
-                    self._i += 2
-                    break
-                case 5:
-                    if self.get_value(self._i + 1, mode_1) != 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 6:
-                    if self.get_value(self._i + 1, mode_1) == 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 7:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        < self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 8:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        == self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 9:
-                    self._relative_base += self.get_value(self._i + 1, mode_1)
-                    self._i += 2
-                case 99:
-                    break
-
-        return output
+        return self._intcode.send(input_)
 
 
 @cache
@@ -157,7 +72,7 @@ def explore(program):
         distances[location] = steps
 
         for command, direction in DIRECTIONS.items():
-            droid_1 = copy.deepcopy(droid_0)
+            droid_1 = droid_0.fork()
 
             match droid_1.run(command):
                 case 0:
@@ -171,10 +86,32 @@ def explore(program):
     return distances[oxygen], oxygen, set(distances.keys())
 
 
+def load_grid(locations):
+    """Load grid of explored locations, with the location of its corner."""
+    top = int(min(location.real for location in locations))
+    left = int(min(location.imag for location in locations))
+    bottom = int(max(location.real for location in locations))
+    right = int(max(location.imag for location in locations))
+    rows = [
+        bytearray(b"#") * (right - left + 1) for _ in range(top, bottom + 1)
+    ]
+
+    for location in locations:
+        rows[int(location.real) - top][int(location.imag) - left] = ord(".")
+
+    return Grid(rows), (top, left)
+
+
 def load_program(puzzle_input):
     """Load program from input."""
     return tuple(map(int, puzzle_input.split(",")))
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
 if __name__ == "__main__":
     main()
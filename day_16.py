@@ -4,13 +4,13 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
-from collections import deque
+import itertools
+import math
 
 
 def main():
     """Solve day 16 puzzles."""
-    with open("data/day_16.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_16.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -19,10 +19,9 @@ def main():
 def star_1(puzzle_input):
     """Solve first puzzle."""
     signal = load_signal(puzzle_input)
-    patterns = compute_patterns(len(signal))
 
     for _ in range(100):
-        signal = compute_signal(signal, patterns)
+        signal = compute_signal(signal)
 
     return "".join(map(str, signal[:8]))
 
@@ -33,59 +32,48 @@ def star_2(puzzle_input):
     offset = int("".join(map(str, signal[:7])))
     signal = signal[offset:]
 
-    for _ in range(100):
-        new_signal = deque()
-        total = 0
-
-        for digit in signal[::-1]:
-            total = (total + digit) % 10
-            new_signal.appendleft(total)
-
-        signal = tuple(new_signal)
-
-    return "".join(map(str, signal[:8]))
-
+    return "".join(map(str, skip_phases(signal, 100, 8)))
 
-def compute_pattern(i, length):
-    """Computer a single pattern."""
-    add = []
-    sub = []
 
-    i += 1
-    j = i
+def binomial_mod(n, k, p):
+    """Compute binomial coefficient modulo a prime with Lucas' theorem."""
+    result = 1
 
-    while j < length + 1:
-        add.extend([k - 1 for k in range(j, min(j + i, length + 1))])
-        j += 2 * i
+    while k:
+        n, n_digit = divmod(n, p)
+        k, k_digit = divmod(k, p)
 
-        if j < length + 1:
-            sub.extend([k - 1 for k in range(j, min(j + i, length + 1))])
-            j += 2 * i
+        if k_digit > n_digit:
+            return 0
 
-    return (tuple(add), tuple(sub))
+        result = result * math.comb(n_digit, k_digit) % p
 
+    return result
 
-def compute_patterns(length):
-    """Compute all patterns."""
-    return tuple(compute_pattern(i, length) for i in range(length))
 
+def compute_signal(signal):
+    """Compute new signal.
 
-def compute_signal(signal, patterns):
-    """Compute new signal."""
+    Each output sums runs of equal pattern values, so it is computed from
+    prefix sums with a number of terms inversely proportional to its
+    position.
+    """
+    length = len(signal)
+    prefix = (0, *itertools.accumulate(signal))
     outputs = []
 
-    for pattern in patterns:
+    for i in range(1, length + 1):
         output = 0
 
-        for i in pattern[0]:
-            output += signal[i]
+        for j in range(i - 1, length, 4 * i):
+            output += prefix[min(j + i, length)] - prefix[j]
+            output -= (
+                prefix[min(j + 3 * i, length)] - prefix[min(j + 2 * i, length)]
+            )
 
-        for i in pattern[1]:
-            output -= signal[i]
+        outputs.append(abs(output) % 10)
 
-        outputs.append(output)
-
-    return tuple(abs(output) % 10 for output in outputs)
+    return tuple(outputs)
 
 
 def load_signal(puzzle_input):
@@ -93,5 +81,40 @@ def load_signal(puzzle_input):
     return tuple(int(digit) for digit in puzzle_input)
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
+def skip_phases(signal, phases, count):
+    """Compute first digits of a signal after phases of suffix sums.
+
+    After k phases each digit is the sum of the following ones weighted by
+    C(k - 1 + d, d) at distance d. Weights are computed modulo 2 and 5 with
+    Lucas' theorem and combined modulo 10, skipping the zero ones.
+    """
+    weights = []
+
+    for d in range(len(signal)):
+        weight = (
+            5 * binomial_mod(phases - 1 + d, d, 2)
+            + 6 * binomial_mod(phases - 1 + d, d, 5)
+        ) % 10
+
+        if weight:
+            weights.append((d, weight))
+
+    return tuple(
+        sum(
+            weight * signal[i + d]
+            for d, weight in weights
+            if i + d < len(signal)
+        )
+        % 10
+        for i in range(count)
+    )
+
+
 if __name__ == "__main__":
     main()
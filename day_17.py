@@ -4,15 +4,18 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
-from collections import defaultdict
+import operator
 
-DIRECTIONS = {1j, -1j, -1, 1}
+from grid import Grid
+from intcode import Intcode
+
+ROBOTS = b"^>v<"
+SCAFFOLDS = b"#" + ROBOTS
 
 
 def main():
     """Solve day 17 puzzles."""
-    with open("data/day_17.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_17.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -20,15 +23,15 @@ def main():
 
 def star_1(puzzle_input):
     """Solve first puzzle."""
-    scaffolds = get_scaffolds(puzzle_input)[0]
-    intersections = {
-        scaffold
-        for scaffold in scaffolds
-        if all(scaffold + direction in scaffolds for direction in DIRECTIONS)
-    }
+    grid = get_scaffolds(puzzle_input)[0]
+    intersections = [
+        index
+        for index in grid.find(SCAFFOLDS)
+        if all(grid[index + offset] in SCAFFOLDS for offset in grid.offsets)
+    ]
 
     return sum(
-        int(intersection.real * intersection.imag)
+        operator.mul(*grid.location(intersection))
         for intersection in intersections
     )
 
@@ -38,95 +41,9 @@ def star_2(puzzle_input):
     robot = load_program("2" + puzzle_input[1:])
 
     path = compute_path(puzzle_input)
+    robot.inputs.extend(path)
 
-    return robot.run(path)[-1]
-
-
-class Intcode:
-    """Intcode program."""
-
-    def __init__(self, program):
-        self._program = defaultdict(int)
-        self._i = 0
-        self._relative_base = 0
-
-        for i, number in enumerate(program):
-            self._program[i] = number
-
-    def get_value(self, index, mode):
-        """Get value of operand."""
-        match mode:
-            case 0:
-                return self._program[self._program[index]]
-            case 1:
-                return self._program[index]
-            case 2:
-                return self._program[
-                    self._program[index] + self._relative_base
-                ]
-
-    def run(self, inputs=None):
-        """Run code with given input."""
-        output = []
-
-        while True:
-            instruction = f"{self._program[self._i]:05}"
-            opcode = int(instruction[3:])
-            mode_1 = int(instruction[2])
-            mode_2 = int(instruction[1])
-            index_1 = self._program[self._i + 1] + self._relative_base * (
-                instruction[2] == "2"
-            )
-            index_3 = self._program[self._i + 3] + self._relative_base * (
-                instruction[0] == "2"
-            )
-
-            match opcode:
-                case 1:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) + self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 2:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) * self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 3:
-                    self._program[index_1] = inputs.pop(0)
-                    self._i += 2
-                case 4:
-                    output.append(self.get_value(self._i + 1, mode_1))
-                    self._i += 2
-                case 5:
-                    if self.get_value(self._i + 1, mode_1) != 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 6:
-                    if self.get_value(self._i + 1, mode_1) == 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 7:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        < self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 8:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        == self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 9:
-                    self._relative_base += self.get_value(self._i + 1, mode_1)
-                    self._i += 2
-                case 99:
-                    break
-
-        return output
+    return robot.run()[-1]
 
 
 def compress(instructions):
@@ -179,53 +96,34 @@ def compress(instructions):
 
 def compute_path(puzzle_input):
     """Compute robot path from input."""
-    scaffolds, robot = get_scaffolds(puzzle_input)
+    grid, robot = get_scaffolds(puzzle_input)
     location, direction = robot
     path = []
     visited = {location}
+    scaffolds = len(grid.find(SCAFFOLDS))
 
-    while visited != scaffolds:
-        if location + direction in scaffolds:
-            location += direction
+    while len(visited) < scaffolds:
+        if grid[location + grid.offsets[direction]] in SCAFFOLDS:
+            location += grid.offsets[direction]
             visited.add(location)
             path[-1] += 1
-        elif location + direction * 1j in scaffolds:
-            direction *= 1j
+        elif grid[location + grid.offsets[direction - 1]] in SCAFFOLDS:
+            direction = (direction - 1) % len(grid.offsets)
             path += ["L", 0]
         else:
-            direction *= -1j
+            direction = (direction + 1) % len(grid.offsets)
             path += ["R", 0]
 
     return compress(",".join(map(str, path)))
 
 
 def get_scaffolds(puzzle_input):
-    """Get scaffolds from input."""
+    """Get grid of scaffolds and robot location and direction from input."""
     intcode = load_program(puzzle_input)
-    output = intcode.run()
-
-    scaffolds = set()
-    i = j = 0
+    grid = Grid("".join(map(chr, intcode.run())).split())
+    location = grid.find(ROBOTS)[0]
 
-    for char in output:
-        match char:
-            case 35:
-                scaffolds.add(i + j * 1j)
-            case 60:
-                robot = (i + j * 1j, -1j)
-            case 62:
-                robot = (i + j * 1j, +1j)
-            case 94:
-                robot = (i + j * 1j, -1)
-            case 118:
-                robot = (i + j * 1j, +1)
-            case 10:
-                j = -1
-                i += 1
-
-        j += 1
-
-    return scaffolds | {robot[0]}, robot
+    return grid, (location, ROBOTS.index(grid[location]))
 
 
 def load_program(puzzle_input):
@@ -233,5 +131,11 @@ def load_program(puzzle_input):
     return Intcode(tuple(map(int, puzzle_input.split(","))))
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
 if __name__ == "__main__":
     main()
@@ -4,16 +4,21 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
+import functools
 import heapq
+import string
 from collections import defaultdict, deque
 
-DIRECTIONS = (1, 1j, -1, -1j)
+from grid import Grid
+
+DOORS = string.ascii_uppercase.encode("ascii")
+KEYS = string.ascii_lowercase.encode("ascii")
+PASSAGES = b".@"
 
 
 def main():
     """Solve day 18 puzzles."""
-    with open("data/day_18.txt", encoding="ascii") as input_file:
-        puzzle_input = tuple(line.rstrip() for line in input_file.readlines())
+    puzzle_input = read_input("data/day_18.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -33,167 +38,250 @@ def star_2(puzzle_input):
     return compute_min_distance(entrances, state)
 
 
-def assign_quadrants(entrances, locations):
-    """Assign locations to quadrants."""
-    quadrants = defaultdict(set)
+class Dominance:
+    """Index of key masks reached by the search at each set of positions.
 
-    for k, v in locations.items():
-        distances = [abs(v - entrance) for entrance in entrances]
-        quadrants[distances.index(min(distances))].add(k)
+    Masks are stored in binary tries over their bits, with the fewest
+    steps of each subtree, so looking for a superset of a mask reached in
+    fewer steps only follows the branches that can contain one.
+    """
 
-    return quadrants
+    def __init__(self, bits):
+        self._bits = bits
+        self._tries = {}
 
+    def add(self, positions, mask, steps):
+        """Record a key mask reached at positions."""
+        node = self._tries.setdefault(positions, [None, None, steps])
+        node[2] = min(node[2], steps)
 
-def compute_distance(start, end, owned, state):
-    """Compute distance between two locations."""
-    paths = deque([(start, 0)])
-    passages = state[0] | {end}
-    keys = state[1]
-    doors = state[2]
+        for bit in range(self._bits - 1, -1, -1):
+            branch = mask >> bit & 1
 
-    best_paths = defaultdict(lambda: float("inf"))
+            if node[branch] is None:
+                node[branch] = [None, None, steps]
 
-    for key in owned:
-        passages.add(keys[key])
+            node = node[branch]
+            node[2] = min(node[2], steps)
 
-        if key in doors:
-            passages.add(doors[key])
+    def dominated(self, positions, mask, steps):
+        """Check if a superset of a mask was reached in no more steps."""
+        nodes = [(self._tries.get(positions), self._bits - 1)]
 
-    while paths:
-        location, steps = paths.pop()
+        while nodes:
+            node, bit = nodes.pop()
 
-        if location == end:
-            return steps
+            if node is None or node[2] > steps:
+                continue
 
-        if steps < best_paths[location]:
-            best_paths[location] = steps
-            steps += 1
+            if bit < 0:
+                return True
 
-            for direction in DIRECTIONS:
-                new_location = location + direction
+            nodes.append((node[1], bit - 1))
 
-                if new_location in passages:
-                    paths.appendleft((new_location, steps))
+            if not mask >> bit & 1:
+                nodes.append((node[0], bit - 1))
+
+        return False
 
-    return None
 
+def compute_bound(distances, keys, mask):
+    """Compute a lower bound on the steps to collect the missing keys.
 
-def compute_min_distance(entrances, state):
-    """Compute minimum distance to collect all keys."""
-    quadrant_keys = assign_quadrants(entrances, state[1])
-    quadrant_doors = assign_quadrants(entrances, state[2])
-
-    paths = [
-        (
-            0,
-            tuple(
-                (int(location.real), int(location.imag))
-                for location in entrances
-            ),
-            frozenset(),
-        )
+    Robots stand on owned keys or entrances, so their paths join each
+    missing key to one of them. Those paths are no shorter than a minimum
+    spanning tree of the missing keys and a root, linked to each key at its
+    distance from the closest owned key or entrance.
+    """
+    sources = [
+        node
+        for node in range(len(distances))
+        if node >= keys or mask >> node & 1
     ]
-    best = {
-        "locations": defaultdict(lambda: defaultdict(lambda: float("inf"))),
-        "owned": defaultdict(lambda: float("inf")),
+    costs = {
+        key: min(distances[source][key] for source in sources)
+        for key in range(keys)
+        if not mask >> key & 1
     }
-    distances = defaultdict(dict)
+    total = 0
+
+    while costs:
+        key = min(costs, key=costs.get)
+        total += costs.pop(key)
+
+        for other in costs:
+            costs[other] = min(costs[other], distances[key][other])
+
+    return total
+
+
+def compute_distances(graph):
+    """Compute table of shortest distances from every node to every key."""
+    distances = [[float("inf")] * len(graph) for _ in graph]
+
+    for node, edges in enumerate(graph):
+        for key, distance, _ in edges:
+            distances[node][key] = min(distances[node][key], distance)
+
+    return distances
+
+
+def compute_edges(start, items, grid):
+    """Compute distances from a location to the keys reachable from it.
+
+    Each key comes with the mask of doors and keys met on the way, that
+    must be owned before going there. Cells are entered again by paths
+    whose mask is not a superset of an earlier one, so each key keeps every
+    edge not dominated by a shorter one with fewer requirements.
+    """
+    edges = []
+    paths = deque([(start, 0, 0)])
+    masks = defaultdict(list)
+    masks[start].append(0)
 
     while paths:
-        steps, locations, owned = heapq.heappop(paths)
+        location, steps, required = paths.popleft()
+        steps += 1
+
+        for offset in grid.offsets:
+            new_location = location + offset
+
+            if new_location in items:
+                kind, bit = items[new_location]
+                new_required = required | 1 << bit
+            elif grid[new_location] in PASSAGES:
+                kind = None
+                new_required = required
+            else:
+                continue
+
+            if any(not mask & ~required for mask in masks[new_location]):
+                continue
+
+            masks[new_location].append(required)
+            paths.append((new_location, steps, new_required))
+
+            if kind == "key" and not required >> bit & 1:
+                edges.append((bit, steps, required))
+
+    return tuple(edges)
+
+
+def compute_graph(entrances, state):
+    """Compute graph of distances between keys and entrances.
+
+    Keys are numbered by their bit in key masks and entrances follow them,
+    so the search only looks up distances and never walks the map again.
+    """
+    grid, keys, doors = state
+    bits = {key: bit for bit, key in enumerate(sorted(keys))}
+    items = {location: ("key", bits[key]) for key, location in keys.items()}
+    items.update(
+        {
+            location: ("door", bits[key])
+            for key, location in doors.items()
+            if key in bits
+        }
+    )
+    starts = [keys[key] for key in sorted(keys)] + list(entrances)
+
+    return tuple(compute_edges(location, items, grid) for location in starts)
+
 
-        if len(owned) == len(state[1]):
+def compute_min_distance(entrances, state, astar=False):
+    """Compute minimum distance to collect all keys.
+
+    In A* mode states are ordered by steps plus a lower bound on the steps
+    left, computed once per key mask.
+    """
+    graph = compute_graph(entrances, state)
+    keys = len(state[1])
+    paths = [(0, 0, tuple(range(keys, keys + len(entrances))), 0)]
+    best = {paths[0][2:]: 0}
+    dominance = Dominance(keys)
+    estimate = estimator(graph, keys, astar)
+
+    while paths:
+        _, steps, positions, mask = heapq.heappop(paths)
+
+        if mask == (1 << keys) - 1:
             return steps
 
-        if any(
-            owned < k and steps >= v for k, v in best["owned"].items()
-        ) or any(
-            owned <= k and steps >= v
-            for k, v in best["locations"][locations].items()
+        if best[(positions, mask)] < steps or dominance.dominated(
+            positions, mask, steps
         ):
             continue
 
-        best["locations"][locations][owned] = steps
-        best["owned"][owned] = steps
-
-        for i, _ in enumerate(locations):
-            location = locations[i][0] + locations[i][1] * 1j
+        dominance.add(positions, mask, steps)
 
-            for key, key_location in state[1].items():
-                if key in owned or key not in quadrant_keys[i]:
-                    continue
-
-                distance = next(
+        for new_steps, new_state in expand(graph, steps, positions, mask):
+            if new_steps < best.get(new_state, float("inf")):
+                best[new_state] = new_steps
+                heapq.heappush(
+                    paths,
                     (
-                        v
-                        for k, v in distances[(location, key_location)].items()
-                        if owned & quadrant_doors[i] >= k
+                        new_steps + estimate(new_state[1]),
+                        new_steps,
+                        *new_state,
                     ),
-                    None,
                 )
 
-                if not distance:
-                    distance = compute_distance(
-                        location, key_location, owned, state
-                    )
-                    distances[(location, key_location)][
-                        owned & quadrant_doors[i]
-                    ] = distance
-
-                if distance:
-                    heapq.heappush(
-                        paths,
-                        (
-                            steps + distance,
-                            locations[:i]
-                            + (
-                                (
-                                    int(key_location.real),
-                                    int(key_location.imag),
-                                ),
-                            )
-                            + locations[i + 1 :],
-                            frozenset(owned | {key}),
-                        ),
-                    )
-
     return None
 
 
+def estimator(graph, keys, astar):
+    """Get a function bounding the steps left from a key mask.
+
+    Bounds depend only on the key mask, so they are cached per mask. Out of
+    A* mode every bound is zero.
+    """
+    if not astar:
+        return lambda mask: 0
+
+    return functools.cache(
+        functools.partial(compute_bound, compute_distances(graph), keys)
+    )
+
+
+def expand(graph, steps, positions, mask):
+    """Generate states reached by moving a robot to a key it can collect."""
+    for i, position in enumerate(positions):
+        for key, distance, required in graph[position]:
+            if not mask >> key & 1 and not required & ~mask:
+                yield steps + distance, (
+                    positions[:i] + (key,) + positions[i + 1 :],
+                    mask | 1 << key,
+                )
+
+
 def load_map(puzzle_input, split=False):
     """Load map from input."""
-    entrances = []
-    passages = set()
-    keys = {}
-    doors = {}
-
-    for i, line in enumerate(puzzle_input):
-        for j, char in enumerate(line):
-            if char == ".":
-                passages.add(i + j * 1j)
-            elif char.islower():
-                keys[char] = i + j * 1j
-            elif char.isupper():
-                doors[char.lower()] = i + j * 1j
-            elif char == "@":
-                passages.add(i + j * 1j)
-                entrances.append(i + j * 1j)
+    grid = Grid(puzzle_input)
+    entrances = grid.find(b"@")
+    keys = {chr(grid[index]): index for index in grid.find(KEYS)}
+    doors = {chr(grid[index]).lower(): index for index in grid.find(DOORS)}
 
     if split is True:
         entrance = entrances.pop(0)
-        passages.remove(entrance)
 
-        for offset in (1 + 1j, 1 - 1j, -1 - 1j, -1 + 1j):
-            entrances.append(entrance + offset)
+        for offset in (0, *grid.offsets):
+            grid[entrance + offset] = ord("#")
 
-        for direction in DIRECTIONS:
-            passages.remove(entrance + direction)
+        for vertical in grid.offsets[::2]:
+            for horizontal in grid.offsets[1::2]:
+                entrances.append(entrance + vertical + horizontal)
 
     return (
         entrances,
-        (passages, keys, doors),
+        (grid, keys, doors),
     )
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return tuple(line.rstrip() for line in input_file.readlines())
+
+
 if __name__ == "__main__":
     main()
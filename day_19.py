@@ -6,14 +6,20 @@ __license__ = "MIT"
 
 import itertools
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 
+from intcode import Intcode, load_image
+
+CHUNK_SIZE = 250
 DIRECTIONS = {1j, -1j, -1, 1}
+REFERENCE_DISTANCE = 100
+SQUARE_CHECK = 10
 
 
 def main():
     """Solve day 19 puzzles."""
-    with open("data/day_19.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_19.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -21,127 +27,182 @@ def main():
 
 def star_1(puzzle_input):
     """Solve first puzzle."""
-    return sum(
-        scan(i, j, puzzle_input)
-        for i, j in itertools.product(range(50), repeat=2)
-    )
+    bitmap = batch_scan(itertools.product(range(50), repeat=2), puzzle_input)
+
+    return sum(row.bit_count() for row in bitmap.values())
 
 
 def star_2(puzzle_input):
     """Solve second puzzle."""
-    x = 99
-    y = 0
+    x, y = Beam(puzzle_input).find_square(100)
 
-    while (
-        not scan(x, y, puzzle_input) == scan(x - 99, y + 99, puzzle_input) == 1
-    ):
-        if scan(x, y, puzzle_input) == 0:
-            y += 1
-        else:
-            x += 1
+    return 10000 * x + y
 
-    x -= 99
 
-    return 10000 * x + y
+class Beam:
+    """Tractor beam tracking the left and right edges of each row."""
+
+    def __init__(self, puzzle_input):
+        self._puzzle_input = puzzle_input
+        self._scans = {}
+        self._edges = {}
+        self._reference = None
+
+    def scan(self, x, y):
+        """Scan a location, memoizing the result."""
+        if (x, y) not in self._scans:
+            self._scans[(x, y)] = scan(x, y, self._puzzle_input)
+
+        return self._scans[(x, y)]
+
+    def edges(self, y):
+        """Get leftmost and rightmost pulled locations of a row."""
+        if y not in self._edges:
+            x = self._inside(y)
+
+            if x is None:
+                self._edges[y] = None
+            else:
+                self._edges[y] = (
+                    self._gallop(x, y, -1),
+                    self._gallop(x, y, 1),
+                )
+
+        return self._edges[y]
+
+    def find_square(self, size):
+        """Find top-left corner of the closest square fitting the beam."""
+        low = size - 1
+        high = 2 * low + 1
+
+        while not self._fits(high, size):
+            low = high
+            high *= 2
+
+        while high - low > 1:
+            middle = (low + high) // 2
+
+            if self._fits(middle, size):
+                high = middle
+            else:
+                low = middle
+
+        y = next(
+            y
+            for y in range(max(size - 1, high - SQUARE_CHECK), high + 1)
+            if self._fits(y, size)
+        )
+
+        return self.edges(y)[0], y - size + 1
+
+    def _fits(self, y, size):
+        """Check if a square fits with its bottom-left corner on row y."""
+        bottom = self.edges(y)
+        top = self.edges(y - size + 1)
 
+        return (
+            bottom is not None
+            and top is not None
+            and top[1] >= bottom[0] + size - 1
+        )
 
-class Intcode:
-    """Intcode program."""
+    def _gallop(self, x, y, step):
+        """Find the edge of a row in a direction from a pulled location."""
+        inside = x
+        outside = x + step
 
-    def __init__(self, program):
-        self._program = defaultdict(int)
-        self._i = 0
-        self._relative_base = 0
+        while outside >= 0 and self.scan(outside, y):
+            inside = outside
+            step *= 2
+            outside = inside + step
 
-        for i, number in enumerate(program):
-            self._program[i] = number
+        while abs(outside - inside) > 1:
+            middle = (inside + outside) // 2
 
-    def get_value(self, index, mode):
-        """Get value of operand."""
-        match mode:
-            case 0:
-                return self._program[self._program[index]]
-            case 1:
-                return self._program[index]
-            case 2:
-                return self._program[
-                    self._program[index] + self._relative_base
-                ]
+            if middle >= 0 and self.scan(middle, y):
+                inside = middle
+            else:
+                outside = middle
 
-    def run(self, inputs=None):
-        """Run code with given input."""
-        output = []
+        return inside
+
+    def _inside(self, y):
+        """Find a pulled location on a row, if any."""
+        if self._reference is None:
+            self._reference = self._find_reference()
+
+        x_0, y_0 = self._reference
+        guess = round(x_0 * y / y_0)
+
+        for offset in range(max(guess, y) + 1):
+            for x in (guess - offset, guess + offset):
+                if x >= 0 and self.scan(x, y):
+                    return x
+
+        return None
+
+    def _find_reference(self):
+        """Find a pulled location away from the origin."""
+        total = REFERENCE_DISTANCE
 
         while True:
-            instruction = f"{self._program[self._i]:05}"
-            opcode = int(instruction[3:])
-            mode_1 = int(instruction[2])
-            mode_2 = int(instruction[1])
-            index_1 = self._program[self._i + 1] + self._relative_base * (
-                instruction[2] == "2"
-            )
-            index_3 = self._program[self._i + 3] + self._relative_base * (
-                instruction[0] == "2"
-            )
-
-            match opcode:
-                case 1:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) + self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 2:
-                    self._program[index_3] = self.get_value(
-                        self._i + 1, mode_1
-                    ) * self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 3:
-                    self._program[index_1] = inputs.pop(0)
-                    self._i += 2
-                case 4:
-                    output.append(self.get_value(self._i + 1, mode_1))
-                    self._i += 2
-                case 5:
-                    if self.get_value(self._i + 1, mode_1) != 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 6:
-                    if self.get_value(self._i + 1, mode_1) == 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 7:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        < self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 8:
-                    self._program[index_3] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        == self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 9:
-                    self._relative_base += self.get_value(self._i + 1, mode_1)
-                    self._i += 2
-                case 99:
-                    break
-
-        return output[0]
+            for x in range(total):
+                if self.scan(x, total - x):
+                    return x, total - x
+
+            total *= 2
+
+
+def batch_scan(coordinates, puzzle_input, workers=None, chunk_size=CHUNK_SIZE):
+    """Scan locations in parallel, returning a bitmap of rows."""
+    coordinates = list(coordinates)
+    chunks = [
+        coordinates[i : i + chunk_size]
+        for i in range(0, len(coordinates), chunk_size)
+    ]
+    bitmap = defaultdict(int)
+
+    with ProcessPoolExecutor(workers) as executor:
+        results = executor.map(
+            scan_chunk, itertools.repeat(puzzle_input), chunks
+        )
+
+        for chunk, pulled in zip(chunks, results):
+            for (x, y), bit in zip(chunk, pulled):
+                bitmap[y] |= bit << x
+
+    return bitmap
 
 
 def load_program(puzzle_input):
     """Load program from input."""
-    return Intcode(tuple(map(int, puzzle_input.split(","))))
+    return Intcode(load_image(puzzle_input))
+
+
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
 
 
 def scan(x, y, puzzle_input):
     """Scan a location."""
-    intcode = load_program(puzzle_input)
+    intcode = warm_program(puzzle_input)
+    intcode.reset()
+    intcode.inputs.extend((x, y))
+
+    return intcode.run()[0]
+
+
+def scan_chunk(puzzle_input, chunk):
+    """Scan a chunk of locations."""
+    return bytes(scan(x, y, puzzle_input) for x, y in chunk)
+
 
-    return intcode.run([x, y])
+@cache
+def warm_program(puzzle_input):
+    """Get a reusable program for input."""
+    return load_program(puzzle_input)
 
 
 if __name__ == "__main__":
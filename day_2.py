@@ -4,11 +4,15 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
+import itertools
+
+INPUTS = range(100)
+TARGET = 19690720
+
 
 def main():
     """Solve day 2 puzzles."""
-    with open("data/day_2.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_2.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -24,14 +28,48 @@ def star_1(puzzle_input):
 def star_2(puzzle_input):
     """Solve second puzzle."""
     numbers = load_numbers(puzzle_input)
-    noun = 0
+    polynomial = run_symbolic(numbers)
+
+    if polynomial is not None:
+        solution = solve(polynomial, TARGET)
+
+        if solution is not None:
+            return 100 * solution[0] + solution[1]
+
+    for noun, verb in itertools.product(INPUTS, repeat=2):
+        if run_program(numbers, noun, verb) == TARGET:
+            return 100 * noun + verb
+
+    return None
+
+
+def add(polynomial_0, polynomial_1):
+    """Add two polynomials."""
+    if polynomial_0 is None or polynomial_1 is None:
+        return None
+
+    total = dict(polynomial_0)
+
+    for powers, coefficient in polynomial_1.items():
+        total[powers] = total.get(powers, 0) + coefficient
+
+    return {k: v for k, v in total.items() if v != 0}
 
-    while True:
-        for verb in range(noun):
-            if run_program(numbers, noun, verb) == 19690720:
-                return 100 * noun + verb
 
-        noun += 1
+def constant(polynomial):
+    """Get value of a constant polynomial."""
+    if polynomial is None or any(powers != (0, 0) for powers in polynomial):
+        return None
+
+    return polynomial.get((0, 0), 0)
+
+
+def evaluate(polynomial, noun, verb):
+    """Evaluate a polynomial."""
+    return sum(
+        coefficient * noun ** powers[0] * verb ** powers[1]
+        for powers, coefficient in polynomial.items()
+    )
 
 
 def load_numbers(puzzle_input):
@@ -39,6 +77,29 @@ def load_numbers(puzzle_input):
     return tuple(map(int, puzzle_input.split(",")))
 
 
+def multiply(polynomial_0, polynomial_1):
+    """Multiply two polynomials."""
+    if polynomial_0 is None or polynomial_1 is None:
+        return None
+
+    product = {}
+
+    for powers_0, coefficient_0 in polynomial_0.items():
+        for powers_1, coefficient_1 in polynomial_1.items():
+            powers = (powers_0[0] + powers_1[0], powers_0[1] + powers_1[1])
+            product[powers] = (
+                product.get(powers, 0) + coefficient_0 * coefficient_1
+            )
+
+    return {k: v for k, v in product.items() if v != 0}
+
+
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
 def run_program(numbers, noun, verb):
     """Run program with given parameters."""
     numbers = list(numbers)
@@ -64,5 +125,71 @@ def run_program(numbers, noun, verb):
     return numbers[0]
 
 
+def run_symbolic(numbers):
+    """Run program with noun and verb as variables.
+
+    Values are polynomials mapping powers of noun and verb to coefficients,
+    or None when read at an address depending on noun or verb. Returns the
+    polynomial left in the first position, if the program can be followed.
+    """
+    numbers = [{(0, 0): number} if number else {} for number in numbers]
+    numbers[1] = {(1, 0): 1}
+    numbers[2] = {(0, 1): 1}
+
+    for i in range(0, len(numbers), 4):
+        try:
+            opcode = constant(numbers[i])
+            address_1, address_2, address_3 = map(
+                constant, numbers[i + 1 : i + 4]
+            )
+
+            if opcode is None:
+                return None
+
+            if opcode == 99:
+                break
+
+            if opcode not in (1, 2):
+                continue
+
+            if address_3 is None:
+                return None
+
+            value_1 = None if address_1 is None else numbers[address_1]
+            value_2 = None if address_2 is None else numbers[address_2]
+
+            if opcode == 1:
+                numbers[address_3] = add(value_1, value_2)
+            else:
+                numbers[address_3] = multiply(value_1, value_2)
+        except (IndexError, ValueError):
+            break
+
+    return numbers[0]
+
+
+def solve(polynomial, target):
+    """Solve for noun and verb when the polynomial is linear in verb."""
+    if any(powers[1] > 1 for powers in polynomial):
+        return None
+
+    for noun in INPUTS:
+        slope = evaluate(
+            {k: v for k, v in polynomial.items() if k[1] == 1}, noun, 1
+        )
+        offset = evaluate(
+            {k: v for k, v in polynomial.items() if k[1] == 0}, noun, 0
+        )
+
+        if slope == 0:
+            if offset == target:
+                return noun, INPUTS[0]
+        elif (target - offset) % slope == 0:
+            if (target - offset) // slope in INPUTS:
+                return noun, (target - offset) // slope
+
+    return None
+
+
 if __name__ == "__main__":
     main()
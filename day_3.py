@@ -4,13 +4,15 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
-DIRECTIONS = {"D": -1j, "L": -1, "R": +1, "U": +1j}
+import bisect
+from collections import defaultdict
+
+DIRECTIONS = {"D": (0, -1), "L": (-1, 0), "R": (1, 0), "U": (0, 1)}
 
 
 def main():
     """Solve day 3 puzzles."""
-    with open("data/day_3.txt", encoding="ascii") as input_file:
-        puzzle_input = tuple(line.rstrip() for line in input_file.readlines())
+    puzzle_input = read_input("data/day_3.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -21,10 +23,7 @@ def star_1(puzzle_input):
     wire_0, wire_1 = load_wires(puzzle_input)
 
     return min(
-        map(
-            lambda point: int(abs(point.real) + abs(point.imag)),
-            set(wire_0[1:]) & set(wire_1[1:]),
-        )
+        abs(x) + abs(y) for x, y, _ in find_intersections(wire_0, wire_1)
     )
 
 
@@ -32,25 +31,119 @@ def star_2(puzzle_input):
     """Solve second puzzle."""
     wire_0, wire_1 = load_wires(puzzle_input)
 
-    return min(
-        map(
-            lambda point: wire_0.index(point) + wire_1.index(point),
-            set(wire_0[1:]) & set(wire_1[1:]),
-        )
-    )
+    return min(steps for _, _, steps in find_intersections(wire_0, wire_1))
+
+
+def find_crossings(horizontals, verticals):
+    """Find crossings of horizontal and vertical segments with a sweep line.
+
+    Sweeping along x, horizontal segments spanning the line are kept sorted
+    by y, and each vertical segment looks up the range of y it covers.
+    """
+    events = []
+
+    for segment in horizontals:
+        events.append((min(segment[0], segment[2]), 0, segment))
+        events.append((max(segment[0], segment[2]), 2, segment))
+
+    for segment in verticals:
+        events.append((segment[0], 1, segment))
+
+    events.sort(key=lambda event: event[:2])
+    active = []
+
+    for x, kind, segment in events:
+        if kind == 0:
+            bisect.insort(active, (segment[1], segment))
+        elif kind == 2:
+            del active[bisect.bisect_left(active, (segment[1], segment))]
+        else:
+            low, high = sorted((segment[1], segment[3]))
+
+            for y, horizontal in active[bisect.bisect_left(active, (low,)) :]:
+                if y > high:
+                    break
+
+                yield x, y, walk(horizontal, x, y) + walk(segment, x, y)
+
+
+def find_intersections(wire_0, wire_1):
+    """Find intersections of two wires, with the steps to reach them.
+
+    Collinear overlaps only yield the points that can minimize either the
+    distance from the origin or the steps.
+    """
+    horizontals_0, verticals_0 = split_segments(wire_0)
+    horizontals_1, verticals_1 = split_segments(wire_1)
+    intersections = [
+        *find_crossings(horizontals_0, verticals_1),
+        *find_crossings(horizontals_1, verticals_0),
+        *find_overlaps(horizontals_0, horizontals_1),
+        *(
+            (x, y, steps)
+            for y, x, steps in find_overlaps(
+                map(transpose, verticals_0), map(transpose, verticals_1)
+            )
+        ),
+    ]
+
+    return [
+        intersection
+        for intersection in intersections
+        if intersection[:2] != (0, 0)
+    ]
+
+
+def find_overlaps(segments_0, segments_1):
+    """Find candidate points shared by collinear horizontal segments.
+
+    Along an overlap both the distance from the origin and the steps are
+    piecewise linear, so only its ends and the points closest to the origin
+    are candidates.
+    """
+    rows = defaultdict(list)
+
+    for segment in segments_1:
+        rows[segment[1]].append(segment)
+
+    for segment_0 in segments_0:
+        y = segment_0[1]
+
+        for segment_1 in rows[y]:
+            low = max(
+                min(segment_0[0], segment_0[2]),
+                min(segment_1[0], segment_1[2]),
+            )
+            high = min(
+                max(segment_0[0], segment_0[2]),
+                max(segment_1[0], segment_1[2]),
+            )
+
+            if low > high:
+                continue
+
+            candidates = {min(max(x, low), high) for x in (-1, 0, 1)}
+
+            for x in candidates | {low, high}:
+                yield x, y, walk(segment_0, x, y) + walk(segment_1, x, y)
 
 
 def load_wire(path):
-    """Load wire from path."""
-    wire = [0 + 0j]
+    """Load wire from path.
+
+    Wires are lists of segments (x_0, y_0, x_1, y_1, steps), from start to
+    end, with the steps along the wire before their start.
+    """
+    wire = []
+    x = y = steps = 0
 
     for step in path.split(","):
-        wire.extend(
-            [
-                wire[-1] + DIRECTIONS[step[0]] * (i + 1)
-                for i in range(int(step[1:]))
-            ]
-        )
+        dx, dy = DIRECTIONS[step[0]]
+        length = int(step[1:])
+        wire.append((x, y, x + dx * length, y + dy * length, steps))
+        x += dx * length
+        y += dy * length
+        steps += length
 
     return wire
 
@@ -60,5 +153,31 @@ def load_wires(puzzle_input):
     return load_wire(puzzle_input[0]), load_wire(puzzle_input[1])
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return tuple(line.rstrip() for line in input_file.readlines())
+
+
+def split_segments(wire):
+    """Split segments of a wire into horizontal and vertical ones."""
+    horizontals = [segment for segment in wire if segment[1] == segment[3]]
+    verticals = [segment for segment in wire if segment[1] != segment[3]]
+
+    return horizontals, verticals
+
+
+def transpose(segment):
+    """Swap coordinates of a segment."""
+    x_0, y_0, x_1, y_1, steps = segment
+
+    return y_0, x_0, y_1, x_1, steps
+
+
+def walk(segment, x, y):
+    """Compute steps along the wire to a point of a segment."""
+    return segment[4] + abs(x - segment[0]) + abs(y - segment[1])
+
+
 if __name__ == "__main__":
     main()
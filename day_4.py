@@ -4,13 +4,14 @@ __author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
 __date__ = "2025"
 __license__ = "MIT"
 
-import re
+from functools import cache
+
+PASSWORD_LENGTH = 6
 
 
 def main():
     """Solve day 4 puzzles."""
-    with open("data/day_4.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_4.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -18,47 +19,74 @@ def main():
 
 def star_1(puzzle_input):
     """Solve first puzzle."""
-    return sum(map(is_password_1, load_range(puzzle_input)))
+    return count_passwords(load_range(puzzle_input), lambda run: run >= 2)
 
 
 def star_2(puzzle_input):
     """Solve second puzzle."""
-    return sum(map(is_password_2, load_range(puzzle_input)))
+    return count_passwords(load_range(puzzle_input), lambda run: run == 2)
 
 
-def is_password(password):
-    """Check if a password is valid."""
-    if len(password) != 6:
-        return False
+def advance(state, digit, rule):
+    """Advance state of a password prefix with a digit.
 
-    for i, _ in enumerate(password[:-1]):
-        if int(password[i]) > int(password[i + 1]):
-            return False
+    States hold the last digit, the length of its run and whether an earlier
+    run satisfied the rule.
+    """
+    last, run, satisfied = state
 
-    return True
+    if digit == last and run:
+        return digit, run + 1, satisfied
 
+    return digit, 1, satisfied or (run > 0 and rule(run))
 
-def is_password_1(number):
-    """Check if a password is valid for star 1."""
-    password = str(number)
 
-    if not is_password(password):
-        return False
+def count_passwords(numbers, rule, length=PASSWORD_LENGTH):
+    """Count valid passwords in a range of numbers.
 
-    return bool(re.search(r"(.)\1+", password))
+    Passwords have non-decreasing digits and a run of equal digits whose
+    length satisfies the rule. They are counted by digit dynamic
+    programming over prefixes of the range bounds, without enumerating
+    them.
+    """
 
+    @cache
+    def completions(remaining, state):
+        if not remaining:
+            return int(state[2] or rule(state[1]))
 
-def is_password_2(number):
-    """Check if a password is valid for star 2."""
-    password = str(number)
+        return sum(
+            completions(remaining - 1, advance(state, digit, rule))
+            for digit in range(state[0], 10)
+        )
 
-    if not is_password(password):
-        return False
+    def count_up_to(number):
+        if number < 10 ** (length - 1):
+            return 0
 
-    return any(
-        len(match_.group(0)) == 2
-        for match_ in re.finditer(r"(.)\1+", password)
-    )
+        state = (1, 0, False)
+        total = 0
+
+        for i, digit in enumerate(map(int, str(number))):
+            for smaller in range(state[0], digit):
+                total += completions(
+                    length - i - 1, advance(state, smaller, rule)
+                )
+
+            if digit < state[0]:
+                return total
+
+            state = advance(state, digit, rule)
+
+        return total + completions(0, state)
+
+    low = max(numbers.start, 10 ** (length - 1))
+    high = min(numbers.stop - 1, 10**length - 1)
+
+    if low > high:
+        return 0
+
+    return count_up_to(high) - count_up_to(low - 1)
 
 
 def load_range(puzzle_input):
@@ -68,5 +96,11 @@ def load_range(puzzle_input):
     )
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
 if __name__ == "__main__":
     main()
@@ -7,8 +7,7 @@ __license__ = "MIT"
 
 def main():
     """Solve day 5 puzzles."""
-    with open("data/day_5.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_5.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -42,6 +41,12 @@ def load_numbers(puzzle_input):
     return tuple(map(int, puzzle_input.split(",")))
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
 def run_program(numbers, input_):
     """Run program with given parameters."""
     numbers = list(numbers)
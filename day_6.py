@@ -9,8 +9,7 @@ from functools import cache
 
 def main():
     """Solve day 6 puzzles."""
-    with open("data/day_6.txt", encoding="ascii") as input_file:
-        puzzle_input = tuple(line.rstrip() for line in input_file.readlines())
+    puzzle_input = read_input("data/day_6.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -72,5 +71,11 @@ def load_orbits(puzzle_input):
     return tuple(orbits.items())
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return tuple(line.rstrip() for line in input_file.readlines())
+
+
 if __name__ == "__main__":
     main()
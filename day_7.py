@@ -5,13 +5,16 @@ __date__ = "2025"
 __license__ = "MIT"
 
 import itertools
-from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from intcode import Intcode, load_image
+
+PREFIX_LENGTH = 2
 
 
 def main():
     """Solve day 7 puzzles."""
-    with open("data/day_7.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_7.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -20,128 +23,123 @@ def main():
 def star_1(puzzle_input):
     """Solve first puzzle."""
     program = load_program(puzzle_input)
-    max_signal = 0
-
-    for phases in itertools.permutations(range(5)):
-        amplifiers = [Amplifier(program, phase) for phase in phases]
-        signal = 0
-
-        for amplifier in amplifiers:
-            amplifier.inputs.append(signal)
-            signal = amplifier.run()
 
-        max_signal = max(max_signal, signal)
-
-    return max_signal
+    return max_signal(program, range(5), amplify)
 
 
 def star_2(puzzle_input):
     """Solve second puzzle."""
     program = load_program(puzzle_input)
-    max_signal = 0
 
-    for phases in itertools.permutations(range(5, 10)):
-        amplifiers = [Amplifier(program, phase) for phase in phases]
-        amplifiers[0].inputs.append(0)
-        output = 0
-        i = 0
+    return max_signal(program, range(5, 10), amplify_loop)
+
+
+class Amplifier:
+    """Amplifier."""
+
+    def __init__(self, program):
+        self._intcode = Intcode(program)
+        self.inputs = self._intcode.inputs
 
-        while any(not amplifier.halted for amplifier in amplifiers):
-            signal = amplifiers[i].run()
+    @property
+    def halted(self):
+        """Whether the amplifier program has halted."""
+        return self._intcode.halted
 
-            if signal is not None:
-                amplifiers[(i + 1) % 5].inputs.append(signal)
+    def reset(self, phase):
+        """Reset program with a phase setting."""
+        self._intcode.reset()
+        self.inputs.append(phase)
 
-            if i == 4 and signal:
-                output = signal
+    def run(self):
+        """Run program."""
+        return next(self._intcode.execution, 0)
 
-            i = (i + 1) % 5
 
-        max_signal = max(max_signal, output)
+def amplify(amplifiers, phases):
+    """Compute signal of amplifiers in series."""
+    signal = 0
 
-    return max_signal
+    for amplifier, phase in zip(amplifiers, phases):
+        amplifier.reset(phase)
+        amplifier.inputs.append(signal)
+        signal = amplifier.run()
 
+    return signal
 
-class Amplifier:
-    """Amplifier."""
 
-    def __init__(self, program, phase):
-        self._program = list(program)
-        self._i = 0
-        self.inputs = deque([phase])
-        self.halted = False
+def amplify_loop(amplifiers, phases):
+    """Compute signal of amplifiers in a feedback loop."""
+    for amplifier, phase in zip(amplifiers, phases):
+        amplifier.reset(phase)
 
-    def get_value(self, index, mode):
-        """Get value of operand."""
-        match mode:
-            case 0:
-                return self._program[self._program[index]]
-            case 1:
-                return self._program[index]
+    amplifiers[0].inputs.append(0)
+    output = 0
+    i = 0
 
-    def run(self):
-        """Run program."""
-        while self._i < len(self._program):
-            instruction = f"{self._program[self._i]:05}"
-            opcode = int(instruction[3:])
-            mode_1 = int(instruction[2])
-            mode_2 = int(instruction[1])
-
-            match opcode:
-                case 1:
-                    self._program[self._program[self._i + 3]] = self.get_value(
-                        self._i + 1, mode_1
-                    ) + self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 2:
-                    self._program[self._program[self._i + 3]] = self.get_value(
-                        self._i + 1, mode_1
-                    ) * self.get_value(self._i + 2, mode_2)
-                    self._i += 4
-                case 3:
-                    if not self.inputs:
-                        return None
-                    self._program[self._program[self._i + 1]] = (
-                        self.inputs.popleft()
-                    )
-                    self._i += 2
-                case 4:
-                    output = self.get_value(self._i + 1, mode_1)
-                    self._i += 2
-                    return output
-                case 5:
-                    if self.get_value(self._i + 1, mode_1) != 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 6:
-                    if self.get_value(self._i + 1, mode_1) == 0:
-                        self._i = self.get_value(self._i + 2, mode_2)
-                    else:
-                        self._i += 3
-                case 7:
-                    self._program[self._program[self._i + 3]] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        < self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 8:
-                    self._program[self._program[self._i + 3]] = int(
-                        self.get_value(self._i + 1, mode_1)
-                        == self.get_value(self._i + 2, mode_2)
-                    )
-                    self._i += 4
-                case 99:
-                    break
-
-        self.halted = True
-
-        return 0
+    while any(not amplifier.halted for amplifier in amplifiers):
+        signal = amplifiers[i].run()
+
+        if signal is not None:
+            amplifiers[(i + 1) % len(amplifiers)].inputs.append(signal)
+
+        if i == len(amplifiers) - 1 and signal:
+            output = signal
+
+        i = (i + 1) % len(amplifiers)
+
+    return output
 
 
 def load_program(puzzle_input):
     """Load program from input."""
-    return tuple(map(int, puzzle_input.split(",")))
+    return load_image(puzzle_input)
+
+
+def max_signal(program, phases, amplify_, workers=1):
+    """Compute maximum signal over all phase permutations.
+
+    With more than one worker, permutations are split by their first
+    phases and searched in a process pool.
+    """
+    phases = tuple(phases)
+
+    if workers == 1:
+        return search(program, phases, amplify_, ())
+
+    prefixes = itertools.permutations(phases, min(PREFIX_LENGTH, len(phases)))
+
+    with ProcessPoolExecutor(workers) as executor:
+        return max(
+            executor.map(
+                search,
+                itertools.repeat(program),
+                itertools.repeat(phases),
+                itertools.repeat(amplify_),
+                prefixes,
+            ),
+            default=0,
+        )
+
+
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
+def search(program, phases, amplify_, prefix):
+    """Compute maximum signal over permutations starting with prefix."""
+    amplifiers = [Amplifier(program) for _ in phases]
+    rest = [phase for phase in phases if phase not in prefix]
+
+    return max(
+        (
+            amplify_(amplifiers, prefix + permutation)
+            for permutation in itertools.permutations(rest)
+        ),
+        default=0,
+    )
 
 
 if __name__ == "__main__":
@@ -10,8 +10,7 @@ WIDTH = 25
 
 def main():
     """Solve day 8 puzzles."""
-    with open("data/day_8.txt", encoding="ascii") as input_file:
-        puzzle_input = input_file.read().rstrip()
+    puzzle_input = read_input("data/day_8.txt")
 
     print(star_1(puzzle_input))
     print(star_2(puzzle_input))
@@ -62,5 +61,11 @@ def load_image(puzzle_input):
     return image
 
 
+def read_input(path):
+    """Read input from file."""
+    with open(path, encoding="ascii") as input_file:
+        return input_file.read().rstrip()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,80 @@
+"""Compact grids"""
+
+__author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
+__date__ = "2025"
+__license__ = "MIT"
+
+
+class Grid:
+    """Grid of byte cells addressed by packed integer indices.
+
+    Rows are stored one after the other in a bytearray, surrounded by a
+    border, so the four neighbours of a cell lie at fixed offsets and never
+    fall outside.
+    """
+
+    def __init__(self, rows, border=0):
+        rows = [
+            row.encode("ascii") if isinstance(row, str) else bytes(row)
+            for row in rows
+        ]
+        self.width = max(map(len, rows), default=0) + 2
+        self.cells = bytearray([border]) * self.width
+
+        for row in rows:
+            self.cells += (
+                bytes([border])
+                + row.ljust(self.width - 2, bytes([border]))
+                + bytes([border])
+            )
+
+        self.cells += bytearray([border]) * self.width
+        self.offsets = (-self.width, 1, self.width, -1)
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __setitem__(self, index, value):
+        self.cells[index] = value
+
+    def find(self, values):
+        """Find indices of cells holding given values."""
+        return [
+            index for index, cell in enumerate(self.cells) if cell in values
+        ]
+
+    def index(self, i, j):
+        """Get index of the cell in row i and column j."""
+        return (i + 1) * self.width + j + 1
+
+    def location(self, index):
+        """Get row and column of a cell index."""
+        i, j = divmod(index, self.width)
+
+        return i - 1, j - 1
+
+
+def flood_fill(grid, starts, passable):
+    """Flood passable cells from starts, returning layers by distance."""
+    seen = bytearray(len(grid.cells))
+    layer = list(starts)
+    layers = []
+
+    for index in layer:
+        seen[index] = 1
+
+    while layer:
+        layers.append(layer)
+        new_layer = []
+
+        for index in layer:
+            for offset in grid.offsets:
+                neighbour = index + offset
+
+                if not seen[neighbour] and grid.cells[neighbour] in passable:
+                    seen[neighbour] = 1
+                    new_layer.append(neighbour)
+
+        layer = new_layer
+
+    return layers
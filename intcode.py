@@ -0,0 +1,756 @@
+"""Intcode computer"""
+
+__author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
+__date__ = "2025"
+__license__ = "MIT"
+
+import argparse
+import hashlib
+import json
+import marshal
+import operator
+import os
+import sys
+import time
+from array import array
+from collections import Counter, deque
+from functools import cache
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".intcode_cache")
+COMPILER_VERSION = 1
+PAGE_BITS = 10
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+ZERO_PAGE = array("q", bytes(8 * PAGE_SIZE))
+OPERATIONS = {
+    1: operator.add,
+    2: operator.mul,
+    7: lambda a, b: int(a < b),
+    8: lambda a, b: int(a == b),
+}
+PARAMETERS = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 9: 1, 99: 0}
+READS = {1: 2, 2: 2, 3: 0, 4: 1, 5: 2, 6: 2, 7: 2, 8: 2, 9: 1, 99: 0}
+
+
+def main():
+    """Run an Intcode program and write an instrumentation report."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("program", help="file with the Intcode program")
+    parser.add_argument("inputs", nargs="*", type=int, help="input values")
+    parser.add_argument(
+        "--report", default="intcode.json", help="report file to write"
+    )
+    args = parser.parse_args()
+
+    with open(args.program, encoding="ascii") as input_file:
+        program = load_image(input_file.read().rstrip())
+
+    intcode = InstrumentedIntcode(program)
+    intcode.inputs.extend(args.inputs)
+
+    print(intcode.run())
+    intcode.profile.write(args.report)
+
+
+class Memory:
+    """Paged Intcode memory with copy-on-write forks.
+
+    Pages of the program image are shared by every memory loaded from it
+    and copied on their first write.
+    """
+
+    def __init__(self, program=()):
+        self.image = paginate(tuple(program))
+        self.pages = dict(self.image)
+        self.writable = {}
+
+    def __getitem__(self, index):
+        page = self.pages.get(index >> PAGE_BITS)
+
+        if page is None:
+            return 0
+
+        return page[index & PAGE_MASK]
+
+    def __setitem__(self, index, value):
+        page = self.writable.get(index >> PAGE_BITS)
+
+        if page is None:
+            page = self.own(index >> PAGE_BITS)
+
+        try:
+            page[index & PAGE_MASK] = value
+        except OverflowError:
+            page = list(page)
+            page[index & PAGE_MASK] = value
+            self.pages[index >> PAGE_BITS] = page
+            self.writable[index >> PAGE_BITS] = page
+
+    def fork(self):
+        """Fork memory, sharing all pages copy-on-write."""
+        other = self.__class__.__new__(self.__class__)
+        other.image = self.image
+        other.pages = self.pages.copy()
+        other.writable = {}
+        self.writable.clear()
+
+        return other
+
+    def own(self, number):
+        """Get a private, writable copy of a page."""
+        page = self.pages.get(number, ZERO_PAGE)[:]
+
+        self.pages[number] = page
+        self.writable[number] = page
+
+        return page
+
+    def reset(self):
+        """Restore the program image, returning addresses that changed."""
+        changed = []
+
+        for number, page in self.pages.items():
+            image = self.image.get(number, ZERO_PAGE)
+
+            if page is image:
+                continue
+
+            if isinstance(page, list):
+                image = list(image)
+
+            ranges = [(0, PAGE_SIZE)]
+
+            while ranges:
+                start, end = ranges.pop()
+
+                if page[start:end] == image[start:end]:
+                    continue
+
+                if end - start == 1:
+                    changed.append(number << PAGE_BITS | start)
+                else:
+                    middle = (start + end) // 2
+                    ranges.extend(((start, middle), (middle, end)))
+
+        self.pages.clear()
+        self.pages.update(self.image)
+        self.writable.clear()
+
+        return changed
+
+
+@cache
+def compile_program(program):
+    """Compile program into Python basic blocks, cached on disk."""
+    digest = hashlib.sha256(",".join(map(str, program)).encode()).hexdigest()
+    path = os.path.join(
+        CACHE_DIR,
+        f"{digest}.{COMPILER_VERSION}.{sys.implementation.cache_tag}.bin",
+    )
+
+    try:
+        with open(path, "rb") as cache_file:
+            code = marshal.load(cache_file)
+    except (OSError, EOFError, ValueError, TypeError):
+        code = compile(translate(program), f"<intcode {digest}>", "exec")
+
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+
+            with open(f"{path}.{os.getpid()}", "wb") as cache_file:
+                marshal.dump(code, cache_file)
+
+            os.replace(f"{path}.{os.getpid()}", path)
+        except OSError:
+            pass
+
+    namespace = {}
+    exec(code, namespace)
+
+    return namespace["BLOCKS"]
+
+
+def decode_static(program, index):
+    """Decode instruction at index of a program image, if valid."""
+    if not 0 <= index < len(program):
+        return None
+
+    instruction = program[index]
+    opcode = instruction % 100
+    modes = (
+        instruction // 100 % 10,
+        instruction // 1000 % 10,
+        instruction // 10000 % 10,
+    )
+
+    if opcode not in PARAMETERS or any(mode > 2 for mode in modes):
+        return None
+
+    size = PARAMETERS[opcode] + 1
+    operands = tuple(
+        program[j] if j < len(program) else 0
+        for j in range(index + 1, index + size)
+    )
+
+    return opcode, modes, operands, size
+
+
+def drop(table, code, index):
+    """Drop entries of table overlapping index, returning whether any was."""
+    dropped = code.pop(index, ())
+
+    for start in dropped:
+        size = table.pop(start)[-1]
+
+        for j in range(start, start + size):
+            if j == index:
+                continue
+
+            starts = tuple(k for k in code[j] if k != start)
+
+            if starts:
+                code[j] = starts
+            else:
+                del code[j]
+
+    return bool(dropped)
+
+
+def find_blocks(program):
+    """Find basic blocks reachable from the entry point and static jumps."""
+    blocks = {}
+    queue = [0]
+    seen = {0}
+
+    while queue:
+        start = queue.pop()
+        instructions = []
+        successors = []
+        i = start
+
+        while (decoded := decode_static(program, i)) is not None:
+            opcode, modes, operands, size = decoded
+
+            if opcode in (3, 4, 99):
+                if opcode != 99:
+                    successors.append(i + size)
+                break
+
+            instructions.append((i, decoded))
+            i += size
+
+            if opcode in (5, 6):
+                successors.append(i)
+
+                if modes[1] == 1:
+                    successors.append(operands[1])
+                break
+
+        if instructions:
+            blocks[start] = (instructions, i)
+
+        for successor in successors:
+            if successor not in seen:
+                seen.add(successor)
+                queue.append(successor)
+
+    return blocks
+
+
+@cache
+def load_image(puzzle_input):
+    """Load program image from input."""
+    return tuple(map(int, puzzle_input.split(",")))
+
+
+@cache
+def paginate(program):
+    """Split a program image into pages."""
+    try:
+        image = array("q", program)
+    except OverflowError:
+        image = list(program)
+
+    image.extend(array("q", bytes(8 * (-len(image) % PAGE_SIZE))))
+
+    return {
+        i >> PAGE_BITS: image[i : i + PAGE_SIZE]
+        for i in range(0, len(image), PAGE_SIZE)
+    }
+
+
+def translate(program):
+    """Translate program basic blocks into Python source."""
+    lines = []
+
+    def operand(mode, value):
+        match mode:
+            case 0:
+                return f"load({value})"
+            case 1:
+                return str(value)
+            case 2:
+                return f"load(rb + {value})"
+
+    def address(mode, value):
+        return f"rb + {value}" if mode == 2 else str(value)
+
+    blocks = find_blocks(program)
+
+    for start, (instructions, end) in sorted(blocks.items()):
+        lines.append(f"def block_{start}(load, store, rb):")
+
+        for i, (opcode, modes, operands, size) in instructions:
+            a = operand(modes[0], operands[0])
+            b = operand(modes[1], operands[1]) if opcode != 9 else None
+            target = (
+                address(modes[2], operands[2])
+                if opcode in (1, 2, 7, 8)
+                else None
+            )
+
+            match opcode:
+                case 1:
+                    lines.append(f"    if store({target}, {a} + {b}):")
+                case 2:
+                    lines.append(f"    if store({target}, {a} * {b}):")
+                case 5:
+                    lines.append(f"    if {a} != 0:")
+                    lines.append(f"        return {b}, rb")
+                case 6:
+                    lines.append(f"    if {a} == 0:")
+                    lines.append(f"        return {b}, rb")
+                case 7:
+                    lines.append(f"    if store({target}, int({a} < {b})):")
+                case 8:
+                    lines.append(f"    if store({target}, int({a} == {b})):")
+                case 9:
+                    lines.append(f"    rb += {a}")
+
+            if opcode in (1, 2, 7, 8):
+                lines.append(f"        return {i + size}, rb")
+
+        lines.append(f"    return {end}, rb")
+        lines.append("")
+
+    lines.append(
+        "BLOCKS = {"
+        + ", ".join(
+            f"{start}: (block_{start}, {end - start})"
+            for start, (_, end) in sorted(blocks.items())
+        )
+        + "}"
+    )
+
+    return "\n".join(lines) + "\n"
+
+
+class Intcode:
+    """Intcode computer with a pre-decoded instruction cache.
+
+    With compiled set, basic blocks of the program are translated into
+    Python functions, falling back to the interpreter wherever the program
+    writes into a compiled block.
+    """
+
+    def __init__(self, program, compiled=False):
+        self.inputs = deque()
+        self.halted = False
+        self._memory = Memory(program)
+        self._i = 0
+        self._relative_base = 0
+        self._decoded = {}
+        self._code = {}
+        self._blocks = {}
+        self._block_code = {}
+        self._shared = False
+        self._execution = None
+
+        if compiled:
+            self._blocks.update(compile_program(tuple(program)))
+
+            for start, (_, size) in self._blocks.items():
+                for j in range(start, start + size):
+                    self._block_code[j] = self._block_code.get(j, ()) + (
+                        start,
+                    )
+
+    def __deepcopy__(self, memo):
+        return self.fork()
+
+    def __getitem__(self, index):
+        return self._memory[index]
+
+    def __setitem__(self, index, value):
+        self.write(index, value)
+
+    def fork(self):
+        """Fork computer, sharing memory and decoded code copy-on-write."""
+        other = self.__class__.__new__(self.__class__)
+        other.__dict__.update(self.__dict__)
+        other.inputs = deque(self.inputs)
+        other._memory = self._memory.fork()
+        other._execution = None
+        self._shared = other._shared = True
+
+        return other
+
+    def reset(self):
+        """Restore the initial state, keeping still valid decoded code."""
+        for index in self._memory.reset():
+            if index in self._code or index in self._block_code:
+                self.invalidate(index)
+
+        self.inputs.clear()
+        self.halted = False
+        self._i = 0
+        self._relative_base = 0
+        self._execution = None
+
+    def snapshot(self):
+        """Take a snapshot of the current state."""
+        return self.fork()
+
+    def restore(self, snapshot):
+        """Restore a state taken with snapshot, keeping the input queue."""
+        inputs = self.inputs
+        self.__dict__.update(snapshot.fork().__dict__)
+        inputs.clear()
+        inputs.extend(self.inputs)
+        self.inputs = inputs
+
+    def unshare(self):
+        """Take private copies of the decoded and compiled code."""
+        if self._shared:
+            self._decoded = self._decoded.copy()
+            self._code = self._code.copy()
+            self._blocks = self._blocks.copy()
+            self._block_code = self._block_code.copy()
+            self._shared = False
+
+    def decode(self, index):
+        """Decode instruction at index into opcode, modes and operands."""
+        self.unshare()
+        instruction = self._memory[index]
+        opcode = instruction % 100
+
+        if opcode not in PARAMETERS:
+            raise ValueError(f"Unknown opcode {instruction} at {index}")
+
+        size = PARAMETERS[opcode] + 1
+        modes = (
+            instruction // 100 % 10,
+            instruction // 1000 % 10,
+            instruction // 10000 % 10,
+        )
+        offset = index & PAGE_MASK
+
+        page = self._memory.pages.get(index >> PAGE_BITS)
+
+        if page is not None and offset + size <= PAGE_SIZE:
+            operands = tuple(page[offset + 1 : offset + size])
+        else:
+            operands = tuple(self._memory[index + j] for j in range(1, size))
+
+        decoded = (opcode, modes, operands, size)
+
+        self._decoded[index] = decoded
+
+        for j in range(index, index + size):
+            self._code[j] = self._code.get(j, ()) + (index,)
+
+        return decoded
+
+    def invalidate(self, index):
+        """Drop code overlapping index, returning whether a block was."""
+        self.unshare()
+        drop(self._decoded, self._code, index)
+
+        return drop(self._blocks, self._block_code, index)
+
+    def write(self, index, value):
+        """Write value to memory, invalidating overwritten instructions."""
+        self._memory[index] = value
+
+        if index in self._code or index in self._block_code:
+            self.invalidate(index)
+
+    @property
+    def execution(self):
+        """Resumable execution of the computer."""
+        if self._execution is None:
+            self._execution = self.execute()
+
+        return self._execution
+
+    def execute(self):
+        """Execute as a coroutine, yielding outputs and receiving inputs.
+
+        Values sent back are queued as inputs. When the program needs an
+        input and none is queued the coroutine yields None.
+        """
+        memory = self._memory
+        pages = memory.pages
+        writable = memory.writable
+        inputs = self.inputs
+        i = self._i
+        relative_base = self._relative_base
+
+        def value(mode, operand):
+            if mode == 1:
+                return operand
+
+            if mode == 2:
+                operand += relative_base
+
+            try:
+                return pages[operand >> PAGE_BITS][operand & PAGE_MASK]
+            except KeyError:
+                return 0
+
+        def load(address):
+            try:
+                return pages[address >> PAGE_BITS][address & PAGE_MASK]
+            except KeyError:
+                return 0
+
+        def store(address, value_):
+            try:
+                writable[address >> PAGE_BITS][address & PAGE_MASK] = value_
+            except (KeyError, OverflowError):
+                memory[address] = value_
+
+            if address in self._code or address in self._block_code:
+                return self.invalidate(address)
+
+            return False
+
+        def write(mode, operand, value_):
+            if mode == 2:
+                operand += relative_base
+
+            store(operand, value_)
+
+        compiled = bool(self._blocks)
+
+        while True:
+            if compiled and i in self._blocks:
+                i, relative_base = self._blocks[i][0](
+                    load, store, relative_base
+                )
+                continue
+
+            decoded = self._decoded.get(i) or self.decode(i)
+            opcode, modes, operands, size = decoded
+
+            match opcode:
+                case 1:
+                    write(
+                        modes[2],
+                        operands[2],
+                        value(modes[0], operands[0])
+                        + value(modes[1], operands[1]),
+                    )
+                case 2:
+                    write(
+                        modes[2],
+                        operands[2],
+                        value(modes[0], operands[0])
+                        * value(modes[1], operands[1]),
+                    )
+                case 3:
+                    while not inputs:
+                        self._i = i
+                        self._relative_base = relative_base
+                        input_ = yield None
+
+                        if input_ is not None:
+                            inputs.append(input_)
+
+                    write(modes[0], operands[0], inputs.popleft())
+                case 4:
+                    self._i = i + size
+                    self._relative_base = relative_base
+                    input_ = yield value(modes[0], operands[0])
+
+                    if input_ is not None:
+                        inputs.append(input_)
+                case 5:
+                    if value(modes[0], operands[0]) != 0:
+                        i = value(modes[1], operands[1])
+                        continue
+                case 6:
+                    if value(modes[0], operands[0]) == 0:
+                        i = value(modes[1], operands[1])
+                        continue
+                case 7:
+                    write(
+                        modes[2],
+                        operands[2],
+                        int(
+                            value(modes[0], operands[0])
+                            < value(modes[1], operands[1])
+                        ),
+                    )
+                case 8:
+                    write(
+                        modes[2],
+                        operands[2],
+                        int(
+                            value(modes[0], operands[0])
+                            == value(modes[1], operands[1])
+                        ),
+                    )
+                case 9:
+                    relative_base += value(modes[0], operands[0])
+                case 99:
+                    self._i = i
+                    self._relative_base = relative_base
+                    self.halted = True
+                    return
+
+            i += size
+
+    def send(self, input_):
+        """Queue an input and resume until the next output, if any."""
+        self.inputs.append(input_)
+
+        return next(self.execution, None)
+
+    def run(self, max_outputs=None):
+        """Run until halted, out of inputs or max_outputs are produced."""
+        output = []
+
+        if max_outputs == 0:
+            return output
+
+        for value in self.execution:
+            if value is None:
+                break
+
+            output.append(value)
+
+            if len(output) == max_outputs:
+                break
+
+        return output
+
+
+class Profile:
+    """Execution counters shared by an instrumented computer and its forks."""
+
+    def __init__(self):
+        self.opcodes = Counter()
+        self.addresses = Counter()
+        self.reads = 0
+        self.writes = 0
+        self.input_waits = 0
+        self.input_time = 0.0
+
+    def report(self):
+        """Summarize counters into a JSON-serializable report."""
+        return {
+            "instructions": self.opcodes.total(),
+            "opcodes": {
+                str(opcode): count
+                for opcode, count in sorted(self.opcodes.items())
+            },
+            "addresses": {
+                str(address): count
+                for address, count in sorted(self.addresses.items())
+            },
+            "reads": self.reads,
+            "writes": self.writes,
+            "input_waits": self.input_waits,
+            "input_time": self.input_time,
+        }
+
+    def write(self, path):
+        """Write report as JSON."""
+        with open(path, "w", encoding="ascii") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+            report_file.write("\n")
+
+
+class InstrumentedIntcode(Intcode):
+    """Intcode computer counting instructions, memory accesses and waits.
+
+    It interprets every instruction, so the plain computer pays nothing for
+    the counters.
+    """
+
+    def __init__(self, program, profile=None):
+        super().__init__(program)
+        self.profile = Profile() if profile is None else profile
+
+    def execute(self):
+        """Execute as a coroutine, updating the profile."""
+        profile = self.profile
+        inputs = self.inputs
+        i = self._i
+        relative_base = self._relative_base
+
+        while True:
+            decoded = self._decoded.get(i) or self.decode(i)
+            opcode, modes, operands, size = decoded
+            profile.opcodes[opcode] += 1
+            profile.addresses[i] += 1
+            parameters = [
+                operand + relative_base if mode == 2 else operand
+                for mode, operand in zip(modes, operands)
+            ]
+            values = []
+
+            for mode, parameter in zip(modes, parameters[: READS[opcode]]):
+                if mode == 1:
+                    values.append(parameter)
+                else:
+                    values.append(self._memory[parameter])
+                    profile.reads += 1
+
+            match opcode:
+                case 1 | 2 | 7 | 8:
+                    self.write(parameters[2], OPERATIONS[opcode](*values))
+                    profile.writes += 1
+                case 3:
+                    while not inputs:
+                        self._i = i
+                        self._relative_base = relative_base
+                        start = time.perf_counter()
+                        input_ = yield None
+                        profile.input_time += time.perf_counter() - start
+                        profile.input_waits += 1
+
+                        if input_ is not None:
+                            inputs.append(input_)
+
+                    self.write(parameters[0], inputs.popleft())
+                    profile.writes += 1
+                case 4:
+                    self._i = i + size
+                    self._relative_base = relative_base
+                    input_ = yield values[0]
+
+                    if input_ is not None:
+                        inputs.append(input_)
+                case 5:
+                    if values[0] != 0:
+                        i = values[1]
+                        continue
+                case 6:
+                    if values[0] == 0:
+                        i = values[1]
+                        continue
+                case 9:
+                    relative_base += values[0]
+                case 99:
+                    self._i = i
+                    self._relative_base = relative_base
+                    self.halted = True
+                    return
+
+            i += size
+
+
+if __name__ == "__main__":
+    main()
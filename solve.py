@@ -0,0 +1,59 @@
+"""Parallel solver of puzzles"""
+
+__author__ = "Martino M. L. Pulici <martinomarelakota@yahoo.it>"
+__date__ = "2025"
+__license__ = "MIT"
+
+import argparse
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import DATA_DIR, STARS, parse_days
+
+
+def main():
+    """Solve puzzles of many days and input sets in parallel."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--days", default="1-19", help="days to run, e.g. 1-5,9"
+    )
+    parser.add_argument(
+        "--data", nargs="+", default=[DATA_DIR], help="input directories"
+    )
+    parser.add_argument("--workers", type=int, help="worker processes")
+    args = parser.parse_args()
+
+    tasks = [
+        (data, day, star)
+        for data in args.data
+        for day in parse_days(args.days)
+        for star in STARS
+    ]
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        futures = [executor.submit(solve, *task) for task in tasks]
+
+        for (data, day, star), future in zip(tasks, futures):
+            answer, elapsed = future.result()
+            print(f"{data} day_{day}.{star} ({elapsed:.3f}s)")
+            print(answer)
+
+    print(f"total ({time.perf_counter() - start:.3f}s)")
+
+
+def solve(data, day, star):
+    """Solve a puzzle, returning answer and elapsed time."""
+    module = importlib.import_module(f"day_{day}")
+    puzzle_input = module.read_input(os.path.join(data, f"day_{day}.txt"))
+
+    start = time.perf_counter()
+    answer = getattr(module, star)(puzzle_input)
+
+    return answer, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()